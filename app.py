@@ -1,30 +1,78 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
+import bottleneck as bn
 import plotly.express as px
 import plotly.graph_objects as go
+import plotly.io as pio
 from datetime import datetime, timedelta
 import os
+import glob
 import tempfile
 import re
+import pickle
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dateutil import parser
-
-TABLE_SETTINGS = {
-    "flavor": "lattice",
-    "strip_text": "\n"
+from extraccion_pdf import MIN_PAGINAS_PARALELO, extract_range, page_ranges
+
+# Copy-on-write: los recortes por periodo son vistas y solo se copian si se modifican.
+# En pandas 3 ya es el comportamiento por defecto y la opción emite un aviso en cada rerun
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
+# Streamlit serializa las figuras con plotly.io.to_json: orjson vuelca los arrays numpy directamente
+pio.json.config.default_engine = "orjson"
+
+# Formatos numéricos enlazados una sola vez (el patrón no se vuelve a analizar en cada llamada)
+MONEY = "${:,.2f}".format
+PCT = "{:.1f}%".format
+
+CATEGORY_PATTERNS = {
+    "Ingresos": r"PAGO INTERBANC|ABONO|DEPÓSITO|NÓMINA|TRANSFERENCIA A FAVOR",
+    "Egresos": r"IMPUESTO|COMISIÓN|RETIRO|PAGO A PROVE|TRANSFERENCIA",
+    "Servicios": r"CUOTA MANEJO|SEGUROS|TARJETA|AGUA|LUZ|GAS"
 }
+# Una sola regex anclada: cada alternativa es un lookahead sobre toda la descripción,
+# así gana la primera categoría en orden de prioridad (no la coincidencia más a la izquierda)
+CATEGORY_RE = re.compile(
+    "^(?:" + "|".join(f"(?=.*(?:{v}))(?P<{k}>)" for k, v in CATEGORY_PATTERNS.items()) + ")",
+    re.DOTALL
+)
+
+# Filas de encabezado que Camelot repite en cada página del extracto
+_HEADER_RE = re.compile(r"FECHA|DESCRIPCIÓN")
+
+class _SoloMontos(dict):
+    # Tabla para str.translate: cualquier carácter no registrado se elimina
+    def __missing__(self, key):
+        return None
+
+# Conserva dígitos, signo y punto decimal; separadores de miles, símbolos y texto desaparecen
+_CURRENCY_TRANS = _SoloMontos((ord(c), ord(c)) for c in "0123456789-.")
 
 def extract_bank_data(pdf_path):
-    import camelot
+    import pdfplumber
     try:
-        tables = camelot.read_pdf(
-            pdf_path, 
-            pages="all",
-            **TABLE_SETTINGS
-        )
-        if len(tables) > 0:
-            full_df = pd.concat([table.df for table in tables])
-            clean_df = full_df[~full_df[0].str.contains("FECHA|DESCRIPCIÓN", na=False)]
+        with pdfplumber.open(pdf_path) as pdf:
+            n_pages = len(pdf.pages)
+        n_procesos = min(os.cpu_count() or 1, n_pages)
+        partes = None
+        if n_pages >= MIN_PAGINAS_PARALELO and n_procesos > 1:
+            tareas = [(pdf_path, r) for r in page_ranges(n_pages, n_procesos)]
+            try:
+                # spawn explícito: nunca se hace fork del servidor de Streamlit, que tiene hilos
+                with ProcessPoolExecutor(max_workers=len(tareas), mp_context=multiprocessing.get_context("spawn")) as ex:
+                    partes = list(ex.map(extract_range, tareas))
+            except (BrokenProcessPool, pickle.PicklingError):
+                # El pool no pudo trabajar: se procesa en serie. Los errores de Camelot se propagan
+                partes = None
+        if partes is None:
+            partes = [extract_range((pdf_path, r)) for r in page_ranges(n_pages, 1)]
+        dfs = [df for parte in partes for df in parte]
+        if len(dfs) > 0:
+            full_df = pd.concat(dfs, ignore_index=True)
+            clean_df = full_df.loc[~full_df[0].str.contains(_HEADER_RE, na=False)]
             return clean_df
         else:
             st.error("No se pudieron detectar tablas en el PDF. Intente con otro archivo.")
@@ -44,20 +92,15 @@ def process_transactions(raw_df):
         currency_cols = ["Valor", "Saldo"]
         for col in currency_cols:
             if col in raw_df.columns:
-                raw_df[col] = raw_df[col].astype(str).str.replace(r"[^\d\-.,]", "", regex=True)
-                raw_df[col] = raw_df[col].str.replace(",", "").astype(float)
-        patterns = {
-            "Ingresos": r"PAGO INTERBANC|ABONO|DEPÓSITO|NÓMINA|TRANSFERENCIA A FAVOR",
-            "Egresos": r"IMPUESTO|COMISIÓN|RETIRO|PAGO A PROVE|TRANSFERENCIA",
-            "Servicios": r"CUOTA MANEJO|SEGUROS|TARJETA|AGUA|LUZ|GAS"
-        }
+                raw_df[col] = raw_df[col].astype(str).str.translate(_CURRENCY_TRANS).astype(np.float64)
         if "Descripción" in raw_df.columns:
-            raw_df["Categoría"] = raw_df["Descripción"].apply(
-                lambda x: next((k for k, v in patterns.items() if re.search(v, str(x))), "Otros")
-            )
-        raw_df["Ingresos"] = np.where(raw_df["Valor"] > 0, raw_df["Valor"], 0)
-        raw_df["Egresos"] = np.where(raw_df["Valor"] < 0, abs(raw_df["Valor"]), 0)
-        raw_df["Flujo Neto"] = raw_df["Valor"]
+            cats = raw_df["Descripción"].astype(str).str.extract(CATEGORY_RE)
+            matched = cats.notna()
+            raw_df["Categoría"] = matched.idxmax(axis=1).where(matched.any(axis=1), "Otros")
+        v = raw_df["Valor"].to_numpy(dtype=np.float64, copy=False)
+        raw_df["Ingresos"] = np.maximum(v, 0.0)
+        raw_df["Egresos"] = np.maximum(-v, 0.0)
+        raw_df["Flujo Neto"] = v
         raw_df = raw_df.sort_values("Fecha")
         raw_df["Saldo Acumulado"] = raw_df["Saldo"]
         return raw_df
@@ -68,28 +111,41 @@ def process_transactions(raw_df):
 def validate_balances(df):
     if df.empty or "Valor" not in df.columns or "Saldo" not in df.columns:
         return pd.DataFrame()
-    calculated = df["Valor"].cumsum() + df["Saldo"].iloc[0] - df["Valor"].iloc[0]
-    discrepancies = df[abs(calculated - df["Saldo"]) > 1]
+    val = df["Valor"].to_numpy(dtype=np.float64)
+    sal = df["Saldo"].to_numpy(dtype=np.float64)
+    calc = np.cumsum(val)
+    calc += sal[0] - val[0]
+    np.subtract(calc, sal, out=calc)
+    discrepancies = df.iloc[np.abs(calc, out=calc) > 1.0]
     return discrepancies
 
+@st.cache_data(show_spinner=False)
+def _parse_pdf_bytes(pdf_bytes):
+    # Cacheado por el contenido del PDF: los reruns no vuelven a invocar Camelot
+    with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmp_file:
+        tmp_file.write(pdf_bytes)
+        tmp_path = tmp_file.name
+    try:
+        raw_data = extract_bank_data(tmp_path)
+    finally:
+        os.unlink(tmp_path)
+    processed_data = process_transactions(raw_data)
+    if processed_data.empty:
+        return processed_data, ""
+    if "Fecha" in processed_data.columns and not processed_data["Fecha"].empty:
+        extracto_mes = processed_data["Fecha"].iat[0].strftime("%B %Y")
+    else:
+        extracto_mes = "Desconocido"
+    return processed_data, extracto_mes
+
 def load_and_process_bank_statement(uploaded_file):
     if uploaded_file is not None:
         try:
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmp_file:
-                tmp_file.write(uploaded_file.getvalue())
-                tmp_path = tmp_file.name
-            raw_data = extract_bank_data(tmp_path)
-            processed_data = process_transactions(raw_data)
-            os.unlink(tmp_path)
+            processed_data, extracto_mes = _parse_pdf_bytes(uploaded_file.getvalue())
             if not processed_data.empty:
                 discrepancies = validate_balances(processed_data)
                 if not discrepancies.empty:
                     st.warning(f"Se encontraron {len(discrepancies)} registros con discrepancias en saldos. Puede afectar la precisión del análisis.")
-                if "Fecha" in processed_data.columns and not processed_data["Fecha"].empty:
-                    extracto_mes = processed_data["Fecha"].iloc[0].strftime("%B %Y")
-                else:
-                    extracto_mes = "Desconocido"
-                processed_data["FechaStr"] = processed_data["Fecha"].dt.strftime("%Y-%m-%d")
                 return processed_data, extracto_mes
             else:
                 st.error("No se pudieron extraer datos válidos del extracto bancario.")
@@ -100,610 +156,231 @@ def load_and_process_bank_statement(uploaded_file):
     else:
         return pd.DataFrame(), ""
 
-def cargar_datos_historicos():
-    if not os.path.exists("datos_bancarios"):
-        return pd.DataFrame()
-    all_files = [os.path.join("datos_bancarios", f) for f in os.listdir("datos_bancarios") if f.endswith('.csv')]
-    if not all_files:
+HISTORICO_DIR = "datos_bancarios"
+NEEDED_COLS = ["Fecha", "Valor", "Descripción", "Ingresos", "Egresos", "Flujo Neto", "Saldo Acumulado"]
+
+def _leer_csv(csv_path):
+    # Solo las columnas que se guardan: una columna ajena con tipos mezclados no rompe la conversión
+    df = pd.read_csv(csv_path, usecols=lambda c: c in NEEDED_COLS)
+    if "Fecha" in df.columns:
+        df["Fecha"] = pd.to_datetime(df["Fecha"])
+    return df
+
+def _parquet_al_dia(csv_path, parquet_path):
+    return os.path.exists(parquet_path) and os.path.getmtime(csv_path) <= os.path.getmtime(parquet_path)
+
+@st.cache_data(show_spinner=False)
+def _convertir_csv(csv_path, mtime):
+    # Un intento por versión del CSV: si falla, no se vuelve a leer hasta que el archivo cambie
+    try:
+        _leer_csv(csv_path).to_parquet(
+            os.path.splitext(csv_path)[0] + '.parquet', engine="pyarrow", compression="zstd", index=False
+        )
+        return None
+    except Exception as e:
+        return str(e)
+
+def migrar_csv_a_parquet():
+    # Cada CSV se convierte una vez y se vuelve a convertir solo si es más reciente que su .parquet
+    if not os.path.exists(HISTORICO_DIR):
+        return
+    for f in os.listdir(HISTORICO_DIR):
+        if not f.endswith('.csv'):
+            continue
+        csv_path = os.path.join(HISTORICO_DIR, f)
+        if _parquet_al_dia(csv_path, os.path.splitext(csv_path)[0] + '.parquet'):
+            continue
+        error = _convertir_csv(csv_path, os.path.getmtime(csv_path))
+        if error is not None:
+            st.warning(f"Error al convertir {csv_path} a Parquet, se leerá el CSV: {error}")
+
+@st.cache_data(ttl=10, show_spinner=False)
+def _firma_historicos():
+    # (archivo, mtime, tamaño) de cada histórico: la clave de caché del cargador cambia solo
+    # cuando cambia un archivo, y el directorio se revisa como mucho cada 10 segundos.
+    # Un CSV editado se reconvierte aquí; si no se pudo convertir, se carga el CSV en su lugar
+    migrar_csv_a_parquet()
+    archivos = set(glob.glob(os.path.join(HISTORICO_DIR, "*.parquet")))
+    for csv_path in glob.glob(os.path.join(HISTORICO_DIR, "*.csv")):
+        parquet_path = os.path.splitext(csv_path)[0] + '.parquet'
+        if not _parquet_al_dia(csv_path, parquet_path):
+            archivos.discard(parquet_path)
+            archivos.add(csv_path)
+    firma = []
+    for f in sorted(archivos):
+        st_info = os.stat(f)
+        firma.append((f, st_info.st_mtime, st_info.st_size))
+    return tuple(firma)
+
+def _leer_historico(filename):
+    import pyarrow.parquet as pq
+    if filename.endswith('.csv'):
+        return _leer_csv(filename)
+    # Solo las columnas que usa el dashboard; Fecha ya viene como datetime64
+    disponibles = set(pq.read_schema(filename).names)
+    return pd.read_parquet(filename, engine="pyarrow", columns=[c for c in NEEDED_COLS if c in disponibles])
+
+def _leer_historico_seguro(filename):
+    try:
+        return _leer_historico(filename), None
+    except Exception as e:
+        return None, str(e)
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _cargar_historicos(firma):
+    if not firma:
         return pd.DataFrame()
+    files = [filename for filename, _, _ in firma]
+    # Lectura en paralelo; los avisos se emiten después, desde el hilo principal
+    with ThreadPoolExecutor(max_workers=min(8, len(files))) as ex:
+        resultados = list(ex.map(_leer_historico_seguro, files))
     all_dfs = []
-    for filename in all_files:
-        try:
-            df = pd.read_csv(filename)
-            if "Fecha" in df.columns:
-                df["Fecha"] = pd.to_datetime(df["Fecha"])
+    for filename, (df, error) in zip(files, resultados):
+        if error is not None:
+            st.warning(f"Error al cargar {filename}: {error}")
+        else:
             all_dfs.append(df)
-        except Exception as e:
-            st.warning(f"Error al cargar {filename}: {str(e)}")
     if all_dfs:
         combined_df = pd.concat(all_dfs, ignore_index=True)
-        combined_df = combined_df.drop_duplicates(subset=["Fecha", "Valor", "Descripción"])
+        # Un solo hash vectorizado por fila en lugar del hash genérico de drop_duplicates
+        h = pd.util.hash_pandas_object(combined_df[["Fecha", "Valor", "Descripción"]], index=False)
+        combined_df = combined_df.loc[~h.duplicated().to_numpy()]
         combined_df = combined_df.sort_values("Fecha")
         return combined_df
     else:
         return pd.DataFrame()
 
-# Simulación de datos
+def cargar_datos_historicos():
+    return _cargar_historicos(_firma_historicos())
+
+# Simulación de datos (cacheada: los datos de demo no cambian entre interacciones)
+@st.cache_data(ttl=3600, show_spinner=False)
 def generar_datos():
     fechas = pd.date_range(datetime.today() - timedelta(days=30), periods=30)
-    ingresos = pd.Series([round(x, 2) for x in np.random.uniform(200, 1500, size=30)])
-    egresos = pd.Series([round(x, 2) for x in np.random.uniform(100, 1200, size=30)])
+    # Datos de demo en float32: la mitad de bytes hacia Plotly; los extractos reales siguen en float64
+    ingresos = np.round(np.random.uniform(200, 1500, size=30), 2).astype(np.float32)
+    egresos = np.round(np.random.uniform(100, 1200, size=30), 2).astype(np.float32)
     df = pd.DataFrame({
         "Fecha": fechas,
         "Ingresos": ingresos,
         "Egresos": egresos,
     })
     df["Flujo Neto"] = df["Ingresos"] - df["Egresos"]
-    df["Saldo Acumulado"] = df["Flujo Neto"].cumsum()
+    df["Saldo Acumulado"] = np.cumsum(df["Flujo Neto"].to_numpy(), dtype=np.float64).astype(np.float32)
     return df
 
-# Configuración de la página
-st.set_page_config(
-    page_title="Dashboard Financiero", 
-    layout="wide", 
-    initial_sidebar_state="expanded",
-    page_icon="💰"
-)
-
-# Estilos CSS modernos - Fase 1
-st.markdown("""
-    <style>
-    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700&display=swap');
-    
-    :root {
-        --primary: #2563EB;
-        --primary-light: #3B82F6;
-        --secondary: #22C55E;
-        --secondary-light: #4ADE80;
-        --background: #F7FAFC;
-        --container: #FFFFFF;
-        --text-main: #1A202C;
-        --text-secondary: #64748B;
-        --border: #E2E8F0;
-        --success: #22C55E;
-        --error: #EF4444;
-        --warning: #FACC15;
-    }
-
-    /* Estilos generales */
-    .main {
-        background-color: var(--background) !important;
-        font-family: 'Inter', -apple-system, BlinkMacSystemFont, sans-serif;
-        color: var(--text-main);
-        padding: 2rem;
-    }
-
-    [data-testid="stSidebar"] {
-        background-color: var(--background) !important;
-        color: var(--text-main) !important;
-    }
-
-    /* Asegurar que el contenedor principal tenga fondo claro */
-    .stApp {
-        background-color: var(--background) !important;
-    }
-
-    /* Asegurar que el contenedor de la barra lateral tenga fondo claro */
-    section[data-testid="stSidebarContent"] {
-        background-color: var(--background) !important;
-        color: var(--text-main) !important;
-    }
-
-    /* Ajustar el color de texto para mejor contraste en fondo claro */
-    .stMarkdown {
-        color: var(--text-main) !important;
-    }
-
-    /* Asegurar que los encabezados tengan el color correcto en fondo claro */
-    h1, h2, h3, h4, h5, h6 {
-        color: var(--text-main) !important;
-    }
-
-    .sidebar .sidebar-content {
-        background-color: var(--container) !important;
-        border-radius: 16px;
-        padding: 1.5rem;
-        box-shadow: 0 1px 3px rgba(0,0,0,0.1);
-    }
-
-    /* Headers */
-    h1, h2, h3 {
-        font-weight: 600;
-        font-family: 'Inter', sans-serif;
-    }
-
-    h1 { font-size: 2rem; margin-bottom: 1rem; }
-    h2 { font-size: 1.5rem; margin-bottom: 0.75rem; }
-    h3 { font-size: 1.25rem; margin-bottom: 0.5rem; }
-
-    /* Tarjetas métricas */
-    .metric-card {
-        background-color: var(--container);
-        border-radius: 12px;
-        padding: 1.5rem;
-        border: 1px solid var(--border);
-        box-shadow: 0 1px 3px rgba(0,0,0,0.1);
-        transition: transform 0.2s ease, box-shadow 0.2s ease;
-    }
-
-    .metric-card:hover {
-        transform: translateY(-2px);
-        box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-    }
-
-    .metric-title {
-        font-size: 0.875rem;
-        color: var(--text-secondary);
-        font-weight: 500;
-        margin-bottom: 0.5rem;
-    }
-
-    .metric-value {
-        font-size: 1.875rem;
-        font-weight: 600;
-        color: var(--text-main);
-        line-height: 1.2;
-    }
-
-    /* Botones */
-    .stButton>button {
-        background-color: var(--primary) !important;
-        color: white !important;
-        border: none !important;
-        border-radius: 8px !important;
-        padding: 0.625rem 1.25rem !important;
-        font-weight: 500 !important;
-        font-size: 0.875rem !important;
-        transition: all 0.2s ease !important;
-        box-shadow: 0 1px 2px rgba(0,0,0,0.05) !important;
-    }
-
-    .stButton>button:hover {
-        background-color: var(--primary-light) !important;
-        box-shadow: 0 4px 6px rgba(37,99,235,0.1) !important;
-    }
-
-    /* Inputs y Selectbox */
-    .stSelectbox [data-baseweb="select"], 
-    .stDateInput > div {
-        background-color: var(--container) !important;
-        border: 1px solid var(--border) !important;
-        border-radius: 8px !important;
-        transition: all 0.2s ease;
-    }
-
-    .stSelectbox [data-baseweb="select"]:focus-within,
-    .stDateInput > div:focus-within {
-        border-color: var(--primary) !important;
-        box-shadow: 0 0 0 2px rgba(37,99,235,0.1) !important;
-    }
-
-    /* Contenedor de gráficos */
-    .chart-container {
-        background-color: var(--container);
-        border-radius: 12px;
-        padding: 1.5rem;
-        border: 1px solid var(--border);
-        box-shadow: 0 1px 3px rgba(0,0,0,0.1);
-        margin-bottom: 1.5rem;
-    }
-
-    /* Tabla de datos */
-    .dataframe {
-        width: 100% !important;
-        background-color: var(--container) !important;
-        border-radius: 8px !important;
-        border: 1px solid var(--border) !important;
-    }
-
-    .dataframe th {
-        background-color: var(--background) !important;
-        color: var(--text-main) !important;
-        font-weight: 600 !important;
-        padding: 0.75rem 1rem !important;
-        font-size: 0.875rem !important;
-    }
-
-    .dataframe td {
-        padding: 0.75rem 1rem !important;
-        font-size: 0.875rem !important;
-        border-top: 1px solid var(--border) !important;
-        color: var(--text-secondary) !important;
-    }
-
-    .dataframe tr:nth-child(even) {
-        background-color: var(--background) !important;
-    }
-
-    /* Tabs */
-    .stTabs [data-baseweb="tab-list"] {
-        gap: 0.5rem;
-        background-color: transparent;
-    }
-
-    .stTabs [data-baseweb="tab"] {
-        background-color: transparent;
-        border: none;
-        color: var(--text-secondary);
-        font-weight: 500;
-        padding: 0.5rem 1rem;
-        border-radius: 8px;
-    }
-
-    .stTabs [aria-selected="true"] {
-        background-color: var(--primary) !important;
-        color: white !important;
-    }
-
-    /* Balance card */
-    .balance-card {
-        background: linear-gradient(135deg, var(--primary-light) 0%, var(--primary) 100%);
-        color: white;
-        border-radius: 12px;
-        padding: 2rem;
-        box-shadow: 0 4px 6px rgba(37,99,235,0.1);
-    }
-
-    .balance-value {
-        font-size: 2.5rem;
-        font-weight: 700;
-        margin: 1rem 0;
-        color: #fff;
-    }
-
-    .balance-label {
-        font-size: 1rem;
-        opacity: 0.95;
-        color: #fff;
-    }
-
-    .balance-secondary {
-        color: rgba(255,255,255,0.85) !important;
-        font-size: 1rem;
-    }
+@st.cache_data(show_spinner=False)
+def generar_datos_2024():
+    fechas = pd.date_range(start="2024-01-01", end="2024-12-31", freq="D")
+    np.random.seed(42)
+    ingresos = np.random.uniform(500, 2000, size=len(fechas))
+    egresos = np.random.uniform(300, 1800, size=len(fechas))
+    df = pd.DataFrame({
+        "Fecha": fechas,
+        "Ingresos": np.round(ingresos, 2).astype(np.float32),
+        "Egresos": np.round(egresos, 2).astype(np.float32)
+    })
+    df["Flujo Neto"] = df["Ingresos"] - df["Egresos"]
+    # Acumulado en float64 para no arrastrar error de redondeo durante 366 días
+    df["Saldo Acumulado"] = np.cumsum(df["Flujo Neto"].to_numpy(), dtype=np.float64).astype(np.float32)
+    return df
 
-    /* Eliminar la franja negra superior de Streamlit y unificar el fondo */
-    header[data-testid="stHeader"] {
-        background-color: var(--background) !important;
-        box-shadow: none !important;
-    }
-    .st-emotion-cache-18ni7ap {
-        background: var(--background) !important;
-    }
-    /* Ocultar la sombra o borde del header si existe */
-    header[data-testid="stHeader"]::before {
-        box-shadow: none !important;
-        border: none !important;
-    }
-    /* Unificar color de fondo en toda la app */
-    body, .stApp {
-        background-color: var(--background) !important;
-    }
-    /* Ajustar el menú desplegable de Streamlit (kebab menu) */
-    [data-testid="stDecoration"] {
-        background-color: var(--background) !important;
-    }
-    /* Ajustar el color del texto del header */
-    header[data-testid="stHeader"] * {
-        color: var(--text-main) !important;
-    }
-    /* Solo textos, títulos y labels del sidebar en color oscuro */
-    [data-testid="stSidebar"] h1,
-    [data-testid="stSidebar"] h2,
-    [data-testid="stSidebar"] h3,
-    [data-testid="stSidebar"] h4,
-    [data-testid="stSidebar"] h5,
-    [data-testid="stSidebar"] h6,
-    [data-testid="stSidebar"] label,
-    [data-testid="stSidebar"] .stRadio label,
-    [data-testid="stSidebar"] .stMarkdown,
-    [data-testid="stSidebar"] .stText,
-    [data-testid="stSidebar"] .st-bb,
-    [data-testid="stSidebar"] .st-c3 {
-        color: var(--text-main) !important;
-    }
-    /* Forzar color negro puro y opacidad total en los labels del radio de fuente de datos del sidebar, incluso deshabilitados */
-    [data-testid="stSidebar"] .stRadio label,
-    [data-testid="stSidebar"] .stRadio div[role="radio"][aria-disabled="true"] label,
-    [data-testid="stSidebar"] .stRadio div[role="radio"][aria-checked] label {
-        color: #000 !important;
-        opacity: 1 !important;
-        font-weight: 600 !important;
-        font-size: 1.05rem !important;
-        font-family: 'Inter', -apple-system, BlinkMacSystemFont, sans-serif !important;
-        letter-spacing: 0.01em;
-    }
-    /* Hacer el texto de los selectbox del sidebar blanco para legibilidad en fondo oscuro */
-    [data-testid="stSidebar"] .stSelectbox div[data-baseweb="select"] *,
-    [data-testid="stSidebar"] .stSelectbox div[data-baseweb="select"] {
-        color: #fff !important;
-    }
-    </style>
-""", unsafe_allow_html=True)
-
-# --- PROCESAMIENTO SEGÚN LA FUENTE DE DATOS ---
-if 'uploaded_file' not in st.session_state:
-    st.session_state['uploaded_file'] = None
-if 'fuente_datos' not in st.session_state:
-    st.session_state['fuente_datos'] = 'Histórico'
-
-# Procesamiento de la fuente de datos y definición de df_dashboard
-if st.session_state['fuente_datos'] == "Nuevo extracto PDF" and st.session_state['uploaded_file'] is not None:
-    df_pdf, extracto_mes = load_and_process_bank_statement(st.session_state['uploaded_file'])
-    if not df_pdf.empty:
-        df_dashboard = df_pdf.copy()
-    else:
-        df_dashboard = cargar_datos_historicos()
-elif st.session_state['fuente_datos'] == "Histórico":
-    df_dashboard = cargar_datos_historicos()
-    if df_dashboard.empty:
-        df_dashboard = generar_datos()
-elif st.session_state['fuente_datos'] == "Datos de prueba 2024":
-    def generar_datos_2024():
-        fechas = pd.date_range(start="2024-01-01", end="2024-12-31", freq="D")
-        np.random.seed(42)
-        ingresos = np.random.uniform(500, 2000, size=len(fechas))
-        egresos = np.random.uniform(300, 1800, size=len(fechas))
-        df = pd.DataFrame({
-            "Fecha": fechas,
-            "Ingresos": np.round(ingresos, 2),
-            "Egresos": np.round(egresos, 2)
-        })
-        df["Flujo Neto"] = df["Ingresos"] - df["Egresos"]
-        df["Saldo Acumulado"] = df["Flujo Neto"].cumsum()
-        return df
-    df_dashboard = generar_datos_2024()
-else:
-    df_dashboard = generar_datos()
-
-# --- UNIFICAR COLUMNAS PARA EL DASHBOARD ---
-columnas_requeridas = ["Fecha", "Ingresos", "Egresos", "Flujo Neto", "Saldo Acumulado"]
-for col in columnas_requeridas:
-    if col not in df_dashboard.columns:
-        df_dashboard[col] = 0
-if "Fecha" in df_dashboard.columns:
-    df_dashboard["Fecha"] = pd.to_datetime(df_dashboard["Fecha"], errors='coerce')
-df_dashboard = df_dashboard.sort_values("Fecha")
-
-# --- SIDEBAR: carga de PDF, selección de fuente y filtros ---
-with st.sidebar:
-    st.markdown("""
-    <div style='text-align: center; margin-bottom: 1.5rem;'>
-        <svg width="40" height="32" viewBox="0 0 40 32" fill="none" xmlns="http://www.w3.org/2000/svg">
-            <rect x="4" y="20" width="6" height="8" rx="2" fill="#2563EB"/>
-            <rect x="12" y="12" width="6" height="16" rx="2" fill="#22C55E"/>
-            <rect x="20" y="6" width="6" height="22" rx="2" fill="#60A5FA"/>
-            <rect x="28" y="2" width="6" height="26" rx="2" fill="#A5B4FC"/>
-        </svg>
-        <div style='font-weight: 700; font-size: 1.25rem; margin-top: 0.5rem; font-family: Inter, sans-serif;'>
-            Control de Flujo de Caja
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
-    st.markdown("### 📄 Cargar Extracto Bancario (PDF)")
-    uploaded_file = st.file_uploader("Selecciona un archivo PDF", type=["pdf"])
-    if uploaded_file is not None:
-        st.session_state['uploaded_file'] = uploaded_file
-    fuente_datos = st.radio(
-        "Fuente de datos",
-        ["Histórico", "Simulado", "Nuevo extracto PDF", "Datos de prueba 2024"],
-        index=0
-    )
-    st.session_state['fuente_datos'] = fuente_datos
-    st.markdown("### Periodo a visualizar")
-    periodo_opcion = st.selectbox(
-        "Selecciona el periodo",
-        ["Mes", "Trimestre", "Semestre", "Año completo"],
-        index=0
+def agregar_por_dia(df):
+    # Una fila por día: los gráficos envían D puntos al navegador en vez de N transacciones
+    diario = df.groupby(df.index.normalize()).agg({
+        "Ingresos": "sum",
+        "Egresos": "sum",
+        "Flujo Neto": "sum",
+        "Saldo Acumulado": "last"
+    })
+    # Solo alimenta gráficos: float32 reduce a la mitad el JSON de Plotly.
+    # Los KPIs se calculan sobre df_filtrado en float64.
+    diario = diario.astype(np.float32)
+    diario["Fecha"] = diario.index
+    return diario
+
+# Las figuras son funciones puras del agregado diario: se cachean por un hash barato del DataFrame
+_HASH_DF = {pd.DataFrame: lambda d: int(pd.util.hash_pandas_object(d, index=True).sum())}
+
+@st.cache_data(show_spinner=False, hash_funcs=_HASH_DF)
+def crear_grafico_ingresos_egresos(df):
+    fig = go.Figure()
+
+    # Configuración de colores moderna
+    fig.add_bar(
+        name="Ingresos",
+        x=df["Fecha"],
+        y=df["Ingresos"],
+        marker_color='#22C55E',
+        opacity=0.9
     )
-    meses = [
-        "Enero", "Febrero", "Marzo", "Abril", "Mayo", "Junio",
-        "Julio", "Agosto", "Septiembre", "Octubre", "Noviembre", "Diciembre"
-    ]
-    trimestres = ["1er Trimestre", "2do Trimestre", "3er Trimestre", "4to Trimestre"]
-    semestres = ["1er Semestre", "2do Semestre"]
-    anio_actual = datetime.now().year
-    mes_seleccionado = None
-    trimestre_seleccionado = None
-    semestre_seleccionado = None
-    if periodo_opcion == "Mes":
-        mes_seleccionado = st.selectbox("Mes", meses, index=datetime.now().month-1)
-    elif periodo_opcion == "Trimestre":
-        trimestre_seleccionado = st.selectbox("Trimestre", trimestres)
-    elif periodo_opcion == "Semestre":
-        semestre_seleccionado = st.selectbox("Semestre", semestres)
-    anio_seleccionado = st.selectbox("Año", [anio_actual-2, anio_actual-1, anio_actual], index=2)
-    datos_actualizados = st.button("Actualizar datos", key="refresh_button")
-
-# --- Resetear fechas al cambiar la fuente de datos ---
-if 'fuente_datos_anterior' not in st.session_state or st.session_state['fuente_datos_anterior'] != st.session_state['fuente_datos']:
-    st.session_state['fecha_min'] = df_dashboard["Fecha"].min().date() if not df_dashboard.empty else datetime.today() - timedelta(days=30)
-    st.session_state['fecha_max'] = df_dashboard["Fecha"].max().date() if not df_dashboard.empty else datetime.today()
-    st.session_state['fuente_datos_anterior'] = st.session_state['fuente_datos']
-
-# --- FILTRADO DE FECHAS Y USO EN DASHBOARD ---
-# Filtrado según periodo seleccionado
-if periodo_opcion == "Mes" and mes_seleccionado:
-    mes_idx = meses.index(mes_seleccionado) + 1
-    df_filtrado = df_dashboard[(df_dashboard["Fecha"].dt.month == mes_idx) & (df_dashboard["Fecha"].dt.year == anio_seleccionado)].copy()
-elif periodo_opcion == "Trimestre" and trimestre_seleccionado:
-    trimestre_map = {
-        "1er Trimestre": [1,2,3],
-        "2do Trimestre": [4,5,6],
-        "3er Trimestre": [7,8,9],
-        "4to Trimestre": [10,11,12]
-    }
-    meses_trimestre = trimestre_map[trimestre_seleccionado]
-    df_filtrado = df_dashboard[(df_dashboard["Fecha"].dt.month.isin(meses_trimestre)) & (df_dashboard["Fecha"].dt.year == anio_seleccionado)].copy()
-elif periodo_opcion == "Semestre" and semestre_seleccionado:
-    semestre_map = {
-        "1er Semestre": [1,2,3,4,5,6],
-        "2do Semestre": [7,8,9,10,11,12]
-    }
-    meses_semestre = semestre_map[semestre_seleccionado]
-    df_filtrado = df_dashboard[(df_dashboard["Fecha"].dt.month.isin(meses_semestre)) & (df_dashboard["Fecha"].dt.year == anio_seleccionado)].copy()
-else:  # Año completo
-    df_filtrado = df_dashboard[df_dashboard["Fecha"].dt.year == anio_seleccionado].copy()
-
-# Contenedor principal
-st.markdown('<div style="padding: 10px">', unsafe_allow_html=True)
-
-# Encabezado con estadísticas principales
-st.markdown('<div style="display: flex; justify-content: space-between; align-items: center;">', unsafe_allow_html=True)
-st.markdown("# 💰 Dashboard Financiero")
-st.markdown("</div>", unsafe_allow_html=True)
-st.markdown('<p style="color: #666; margin-bottom: 30px;">Actualizado: ' + datetime.now().strftime("%d/%m/%Y %H:%M") + '</p>', unsafe_allow_html=True)
-
-# KPIs en tarjetas modernas
-st.markdown("## Resumen Financiero")
-kpi_cols = st.columns(4)
-
-with kpi_cols[0]:
-    total_ingresos = df_filtrado["Ingresos"].sum()
-    st.markdown(f"""
-    <div class="metric-card">
-        <div class="metric-title">Total Ingresos</div>
-        <div class="metric-value" style="color: var(--success);">${total_ingresos:,.2f}</div>
-        <div style="font-size: 0.875rem; color: var(--text-secondary); margin-top: 0.5rem;">
-            Periodo actual
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
-
-with kpi_cols[1]:
-    total_egresos = df_filtrado["Egresos"].sum()
-    st.markdown(f"""
-    <div class="metric-card">
-        <div class="metric-title">Total Egresos</div>
-        <div class="metric-value" style="color: var(--error);">${total_egresos:,.2f}</div>
-        <div style="font-size: 0.875rem; color: var(--text-secondary); margin-top: 0.5rem;">
-            Periodo actual
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
 
-with kpi_cols[2]:
-    flujo_neto = total_ingresos - total_egresos
-    color = "var(--success)" if flujo_neto >= 0 else "var(--error)"
-    st.markdown(f"""
-    <div class="metric-card">
-        <div class="metric-title">Flujo Neto</div>
-        <div class="metric-value" style="color: {color};">${flujo_neto:,.2f}</div>
-        <div style="font-size: 0.875rem; color: var(--text-secondary); margin-top: 0.5rem;">
-            {(flujo_neto/total_ingresos)*100:.1f}% del ingreso
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
+    fig.add_bar(
+        name="Egresos",
+        x=df["Fecha"],
+        y=df["Egresos"],
+        marker_color='#EF4444',
+        opacity=0.9
+    )
 
-with kpi_cols[3]:
-    if not df_filtrado.empty:
-        saldo_actual = df_filtrado["Saldo Acumulado"].iloc[-1]
-        fecha_max = df_filtrado["Fecha"].max().strftime("%d/%m/%Y")
-    else:
-        saldo_actual = 0
-        fecha_max = "-"
-    color = "var(--success)" if saldo_actual >= 0 else "var(--error)"
-    st.markdown(f"""
-    <div class="metric-card">
-        <div class="metric-title">Saldo Actual</div>
-        <div class="metric-value" style="color: {color};">${saldo_actual:,.2f}</div>
-        <div style="font-size: 0.875rem; color: var(--text-secondary); margin-top: 0.5rem;">
-            al {fecha_max}
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
+    # WebGL: la línea de flujo no crece el DOM con vistas anuales
+    fig.add_trace(go.Scattergl(
+        name="Flujo Neto",
+        x=df["Fecha"],
+        y=df["Flujo Neto"],
+        line=dict(color='#2563EB', width=2.5)
+    ))
 
-# Visualización principal - Sección de gráficos
-st.markdown("## Análisis de Flujo de Caja")
-
-# Pestañas para diferentes análisis
-tab1, tab2, tab3 = st.tabs(["💵 Ingresos vs Egresos", "📊 Saldo Acumulado", "📈 Tendencias"])
-
-with tab1:
-    st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-    
-    # Actualizar gráfico principal
-    def crear_grafico_ingresos_egresos(df):
-        fig = go.Figure()
-        
-        # Configuración de colores moderna
-        fig.add_bar(
-            name="Ingresos",
-            x=df["Fecha"],
-            y=df["Ingresos"],
-            marker_color='#22C55E',
-            opacity=0.9
-        )
-        
-        fig.add_bar(
-            name="Egresos",
-            x=df["Fecha"],
-            y=df["Egresos"],
-            marker_color='#EF4444',
-            opacity=0.9
-        )
-        
-        fig.add_scatter(
-            name="Flujo Neto",
-            x=df["Fecha"],
-            y=df["Flujo Neto"],
-            line=dict(color='#2563EB', width=2.5)
-        )
-        
-        fig.update_layout(
-            template='plotly_white',
-            height=400,
-            margin=dict(l=20, r=20, t=40, b=20),
-            paper_bgcolor='rgba(0,0,0,0)',
-            plot_bgcolor='rgba(0,0,0,0)',
+    fig.update_layout(
+        template='plotly_white',
+        height=400,
+        margin=dict(l=20, r=20, t=40, b=20),
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        font=dict(
+            family="Inter, sans-serif",
+            size=12,
+            color="#1A202C"  # Color más oscuro para mejor legibilidad
+        ),
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=1.02,
+            xanchor="right",
+            x=1,
+            bgcolor='rgba(255,255,255,0.9)',
+            bordercolor='rgba(0,0,0,0.1)',
+            borderwidth=1,
             font=dict(
-                family="Inter, sans-serif",
                 size=12,
-                color="#1A202C"  # Color más oscuro para mejor legibilidad
-            ),
-            legend=dict(
-                orientation="h",
-                yanchor="bottom",
-                y=1.02,
-                xanchor="right",
-                x=1,
-                bgcolor='rgba(255,255,255,0.9)',
-                bordercolor='rgba(0,0,0,0.1)',
-                borderwidth=1,
-                font=dict(
-                    size=12,
-                    color="#1A202C"
-                )
-            ),
-            xaxis=dict(
-                showgrid=True,
-                gridcolor='rgba(0,0,0,0.1)',
-                tickformat="%d %b",
-                tickfont=dict(size=11, color="#1A202C"),
-                title_font=dict(size=12, color="#1A202C")
-            ),
-            yaxis=dict(
-                showgrid=True,
-                gridcolor='rgba(0,0,0,0.1)',
-                tickformat="$,.0f",
-                tickfont=dict(size=11, color="#1A202C"),
-                title_font=dict(size=12, color="#1A202C")
+                color="#1A202C"
             )
+        ),
+        xaxis=dict(
+            showgrid=True,
+            gridcolor='rgba(0,0,0,0.1)',
+            tickformat="%d %b",
+            tickfont=dict(size=11, color="#1A202C"),
+            title_font=dict(size=12, color="#1A202C")
+        ),
+        yaxis=dict(
+            showgrid=True,
+            gridcolor='rgba(0,0,0,0.1)',
+            tickformat="$,.0f",
+            tickfont=dict(size=11, color="#1A202C"),
+            title_font=dict(size=12, color="#1A202C")
         )
-        
-        return fig
-    
-    fig = crear_grafico_ingresos_egresos(df_filtrado)
-    st.plotly_chart(fig, use_container_width=True)
-    st.markdown('</div>', unsafe_allow_html=True)
+    )
 
-with tab2:
-    st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+    return fig
+
+@st.cache_data(show_spinner=False, hash_funcs=_HASH_DF)
+def crear_grafico_saldo(df):
     # Crear área sombreada para el saldo
     fig2 = go.Figure()
     fig2.add_trace(go.Scatter(
-        x=df_filtrado["Fecha"],
-        y=df_filtrado["Saldo Acumulado"],
+        x=df["Fecha"],
+        y=df["Saldo Acumulado"],
         mode='lines',
         fill='tozeroy',
         name='Saldo',
@@ -713,9 +390,9 @@ with tab2:
     # Línea de referencia en cero
     fig2.add_shape(
         type="line",
-        x0=df_filtrado["Fecha"].min(),
+        x0=df["Fecha"].min(),
         y0=0,
-        x1=df_filtrado["Fecha"].max(),
+        x1=df["Fecha"].max(),
         y1=0,
         line=dict(color="rgba(0,0,0,0.3)", width=1, dash="dash")
     )
@@ -749,270 +426,502 @@ with tab2:
         plot_bgcolor='rgba(0,0,0,0)',
         paper_bgcolor='rgba(0,0,0,0)'
     )
-    st.plotly_chart(fig2, use_container_width=True)
-    st.markdown('</div>', unsafe_allow_html=True)
-
-with tab3:
-    st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-    # Análisis de tendencias con medias móviles
-    df_tendencias = df_filtrado.copy()
-    if len(df_tendencias) >= 7:  # Solo calcular si hay suficientes datos
-        df_tendencias["MA7_Ingresos"] = df_tendencias["Ingresos"].rolling(window=7).mean()
-        df_tendencias["MA7_Egresos"] = df_tendencias["Egresos"].rolling(window=7).mean()
-        fig3 = go.Figure()
-        # Ingresos puntuales y tendencia
-        fig3.add_scatter(
-            x=df_tendencias["Fecha"],
-            y=df_tendencias["Ingresos"],
-            mode='markers',
-            name='Ingresos',
-            marker=dict(color='#22C55E', size=8, opacity=0.5),
-            showlegend=True
-        )
-        fig3.add_scatter(
-            x=df_tendencias["Fecha"],
-            y=df_tendencias["MA7_Ingresos"],
-            mode='lines',
-            name='Media móvil (Ingresos)',
-            line=dict(color='#22C55E', width=3),
-            showlegend=True
-        )
-        # Egresos puntuales y tendencia
-        fig3.add_scatter(
-            x=df_tendencias["Fecha"],
-            y=df_tendencias["Egresos"],
-            mode='markers',
-            name='Egresos',
-            marker=dict(color='#EF4444', size=8, opacity=0.5),
-            showlegend=True
-        )
-        fig3.add_scatter(
-            x=df_tendencias["Fecha"],
-            y=df_tendencias["MA7_Egresos"],
-            mode='lines',
-            name='Media móvil (Egresos)',
-            line=dict(color='#EF4444', width=3),
-            showlegend=True
-        )
-        # Estilo mejorado y legible
-        fig3.update_layout(
-            height=400,
-            template="plotly_white",
-            margin=dict(l=20, r=20, t=40, b=20),
-            title="Análisis de Tendencias (Media Móvil 7 días)",
-            font=dict(
-                family="Inter, sans-serif",
-                size=12,
-                color="#1A202C"
-            ),
-            legend=dict(
-                orientation="h",
-                yanchor="bottom",
-                y=1.02,
-                xanchor="right",
-                x=1,
-                bgcolor='rgba(255,255,255,0.9)',
-                bordercolor='rgba(0,0,0,0.1)',
-                borderwidth=1,
-                font=dict(
-                    size=12,
-                    color="#1A202C"
-                )
-            ),
-            xaxis=dict(
-                title="",
-                showgrid=True,
-                gridcolor='rgba(0,0,0,0.1)',
-                tickformat="%d %b",
-                tickfont=dict(size=11, color="#1A202C"),
-                title_font=dict(size=12, color="#1A202C")
-            ),
-            yaxis=dict(
-                title="Monto ($)",
-                showgrid=True,
-                gridcolor='rgba(0,0,0,0.1)',
-                tickfont=dict(size=11, color="#1A202C"),
-                title_font=dict(size=12, color="#1A202C")
-            ),
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)'
+    return fig2
+
+# Estilo del gráfico de tendencias: constante, se construye una sola vez
+TREND_LAYOUT = dict(
+    height=400,
+    template="plotly_white",
+    margin=dict(l=20, r=20, t=40, b=20),
+    title="Análisis de Tendencias (Media Móvil 7 días)",
+    font=dict(
+        family="Inter, sans-serif",
+        size=12,
+        color="#1A202C"
+    ),
+    legend=dict(
+        orientation="h",
+        yanchor="bottom",
+        y=1.02,
+        xanchor="right",
+        x=1,
+        bgcolor='rgba(255,255,255,0.9)',
+        bordercolor='rgba(0,0,0,0.1)',
+        borderwidth=1,
+        font=dict(
+            size=12,
+            color="#1A202C"
         )
-        st.plotly_chart(fig3, use_container_width=True)
-    else:
-        st.warning("Se necesitan al menos 7 días de datos para mostrar tendencias.")
-    st.markdown('</div>', unsafe_allow_html=True)
+    ),
+    xaxis=dict(
+        title="",
+        showgrid=True,
+        gridcolor='rgba(0,0,0,0.1)',
+        tickformat="%d %b",
+        tickfont=dict(size=11, color="#1A202C"),
+        title_font=dict(size=12, color="#1A202C")
+    ),
+    yaxis=dict(
+        title="Monto ($)",
+        showgrid=True,
+        gridcolor='rgba(0,0,0,0.1)',
+        tickfont=dict(size=11, color="#1A202C"),
+        title_font=dict(size=12, color="#1A202C")
+    ),
+    plot_bgcolor='rgba(0,0,0,0)',
+    paper_bgcolor='rgba(0,0,0,0)'
+)
+
+@st.cache_data(show_spinner=False, hash_funcs=_HASH_DF)
+def crear_grafico_tendencias(df):
+    # Medias móviles de 7 días sobre el agregado diario; en float32, como el resto del gráfico
+    df = df.copy()
+    df["MA7_Ingresos"] = bn.move_mean(df["Ingresos"].to_numpy(), window=7)
+    df["MA7_Egresos"] = bn.move_mean(df["Egresos"].to_numpy(), window=7)
+    fig3 = go.Figure()
+    # Ingresos puntuales y tendencia
+    fig3.add_trace(go.Scattergl(
+        x=df["Fecha"],
+        y=df["Ingresos"],
+        mode='markers',
+        name='Ingresos',
+        marker=dict(color='#22C55E', size=8, opacity=0.5),
+        showlegend=True
+    ))
+    fig3.add_scatter(
+        x=df["Fecha"],
+        y=df["MA7_Ingresos"],
+        mode='lines',
+        name='Media móvil (Ingresos)',
+        line=dict(color='#22C55E', width=3),
+        showlegend=True
+    )
+    # Egresos puntuales y tendencia
+    fig3.add_trace(go.Scattergl(
+        x=df["Fecha"],
+        y=df["Egresos"],
+        mode='markers',
+        name='Egresos',
+        marker=dict(color='#EF4444', size=8, opacity=0.5),
+        showlegend=True
+    ))
+    fig3.add_scatter(
+        x=df["Fecha"],
+        y=df["MA7_Egresos"],
+        mode='lines',
+        name='Media móvil (Egresos)',
+        line=dict(color='#EF4444', width=3),
+        showlegend=True
+    )
+    fig3.update_layout(**TREND_LAYOUT)
+    return fig3
 
-# Sección inferior - Tarjetas y tabla
-col1, col2 = st.columns([1, 2])
+def render_fig(fig):
+    # Punto único de salida para las figuras del dashboard
+    st.plotly_chart(fig, use_container_width=True)
 
-with col1:
+# HTML estático: se construye una sola vez al importar el módulo
+TIMELINE_HTML = """
+<div class="timeline">
+    <div class="timeline-item">
+        <div class="timeline-dot" style="background-color: #F44336;"></div>
+        <div class="timeline-text">
+            <strong>Pago de proveedores</strong><br>
+            <span style="color: #777;">28/04/2025</span>
+        </div>
+    </div>
+    <div class="timeline-item">
+        <div class="timeline-dot" style="background-color: #4CAF50;"></div>
+        <div class="timeline-text">
+            <strong>Cobro de factura #1234</strong><br>
+            <span style="color: #777;">30/04/2025</span>
+        </div>
+    </div>
+    <div class="timeline-item">
+        <div class="timeline-dot" style="background-color: #2196F3;"></div>
+        <div class="timeline-text">
+            <strong>Cierre contable mensual</strong><br>
+            <span style="color: #777;">01/05/2025</span>
+        </div>
+    </div>
+</div>
+"""
+
+EMPTY_STATE_HTML = """
+<div class="metric-card" style="text-align: center;">
+    <div class="metric-title">Sin datos para el periodo seleccionado</div>
+    <div style="font-size: 0.875rem; color: var(--text-secondary);">Elige otro periodo o fuente de datos.</div>
+</div>
+"""
+
+FOOTER_HTML = """
+<div style="text-align: center; margin-top: 50px; padding: 20px; color: #666;">
+    <p>Desarrollado por Willo con ❤️ usando Streamlit</p>
+    <p style="font-size: 12px;">Actualizado el {}</p>
+</div>
+"""
+
+@st.cache_data(ttl=60, show_spinner=False)
+def footer_html():
+    # La marca de tiempo del pie se renueva como mucho una vez por minuto
+    return FOOTER_HTML.format(datetime.now().strftime("%d/%m/%Y %H:%M"))
+
+def metric_card(title, value, color="", subtitle=None):
+    # Tarjeta métrica común a KPIs y comparativa
+    style = f' style="color: {color};"' if color else ""
+    html = f'<div class="metric-card"><div class="metric-title">{title}</div><div class="metric-value"{style}>{value}</div>'
+    if subtitle is not None:
+        html += f'<div style="font-size: 0.875rem; color: var(--text-secondary); margin-top: 0.5rem;">{subtitle}</div>'
+    return html + '</div>'
+
+def resumir_periodo(df):
+    # Todas las reducciones que usan KPIs, balance y comparativa, una vez por columna.
+    # Solo se llama con periodos no vacíos
+    ingresos = df["Ingresos"].to_numpy(dtype=np.float64)
+    egresos = df["Egresos"].to_numpy(dtype=np.float64)
+    flujo = df["Flujo Neto"].to_numpy(dtype=np.float64)
+    saldo = df["Saldo Acumulado"].to_numpy(dtype=np.float64)
+    return {
+        "Ingresos": {"sum": np.nansum(ingresos)},
+        "Egresos": {"sum": np.nansum(egresos), "mean": np.nanmean(egresos)},
+        "Flujo Neto": {"sum": np.nansum(flujo), "mean": np.nanmean(flujo)},
+        "Saldo Acumulado": {"last": df["Saldo Acumulado"].iat[-1], "mean": np.nanmean(saldo)},
+        # df viene ordenado por Fecha: la última fila es la fecha máxima
+        "Fecha": {"max": df["Fecha"].iat[-1]},
+    }
+
+ESTADOS = ["Completado", "Pendiente", "En proceso"]
+
+@st.cache_data(show_spinner=False, hash_funcs=_HASH_DF)
+def construir_tabla(df_tail):
+    # Estado simulado con semilla fija: se genera una vez por tabla y no parpadea entre reruns
+    rng = np.random.default_rng(42)
+    codigos = rng.integers(0, len(ESTADOS), size=len(df_tail), dtype=np.int8)
+    # Tabla nueva con solo las columnas visibles, sin copiar el recorte completo.
+    # Montos numéricos: el formato lo pone column_config y la tabla sigue ordenando por valor
+    return pd.DataFrame({
+        "Fecha": df_tail["Fecha"].to_numpy(),
+        "Ingresos": df_tail["Ingresos"].to_numpy(),
+        "Egresos": df_tail["Egresos"].to_numpy(),
+        "Flujo Neto": df_tail["Flujo Neto"].to_numpy(),
+        # Un flujo en cero cuenta como ingreso y uno vacío (NaN) como egreso, como antes
+        "Tipo": np.where(df_tail["Flujo Neto"].to_numpy() >= 0, "Ingreso", "Egreso"),
+        "Estado": pd.Categorical.from_codes(codigos, categories=ESTADOS),
+    })
+
+# Estilos CSS modernos - Fase 1
+@st.cache_resource
+def _load_css():
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets", "style.css"), encoding="utf-8") as f:
+        return f.read()
+
+# --- SECCIONES INFERIORES: funciones simples; se vuelven a ejecutar con el fragmento del dashboard ---
+def _render_balance(stats):
     # Tarjeta de balance estilo moderno
     st.markdown("### Balance Actual")
-    try:
-        if not df_filtrado.empty:
-            saldo_actual = df_filtrado["Saldo Acumulado"].iloc[-1]
-            promedio_saldo = df_filtrado["Saldo Acumulado"].mean()
-            ultima_fecha = df_filtrado["Fecha"].max().strftime("%d/%m/%Y")
-        else:
-            saldo_actual = 0
-            promedio_saldo = 0
-            ultima_fecha = datetime.now().strftime("%d/%m/%Y")
-    except (IndexError, AttributeError):
-        saldo_actual = 0
-        promedio_saldo = 0
-        ultima_fecha = datetime.now().strftime("%d/%m/%Y")
-    balance_color = '#9CFFA3' if saldo_actual >= 0 else '#FFCDD2'
+    saldo_actual = stats["Saldo Acumulado"]["last"]
+    promedio_saldo = stats["Saldo Acumulado"]["mean"]
+    ultima_fecha = stats["Fecha"]["max"].strftime("%d/%m/%Y")
     balance_icon = '↗' if saldo_actual >= 0 else '↘'
     st.markdown(f"""
     <div class="balance-card">
         <div class="balance-label">Saldo disponible</div>
-        <div class="balance-value">{balance_icon} ${saldo_actual:,.2f}</div>
+        <div class="balance-value">{balance_icon} {MONEY(saldo_actual)}</div>
         <div style="display: flex; justify-content: space-between; align-items: center;" class="balance-secondary">
-            <span>Promedio: ${promedio_saldo:,.2f}</span>
+            <span>Promedio: {MONEY(promedio_saldo)}</span>
             <span>{ultima_fecha}</span>
         </div>
     </div>
     """, unsafe_allow_html=True)
-    
+
     # Timeline de eventos financieros
     st.markdown("### Próximos eventos")
-    
-    st.markdown("""
-    <div class="timeline">
-        <div class="timeline-item">
-            <div class="timeline-dot" style="background-color: #F44336;"></div>
-            <div class="timeline-text">
-                <strong>Pago de proveedores</strong><br>
-                <span style="color: #777;">28/04/2025</span>
-            </div>
-        </div>
-        <div class="timeline-item">
-            <div class="timeline-dot" style="background-color: #4CAF50;"></div>
-            <div class="timeline-text">
-                <strong>Cobro de factura #1234</strong><br>
-                <span style="color: #777;">30/04/2025</span>
-            </div>
-        </div>
-        <div class="timeline-item">
-            <div class="timeline-dot" style="background-color: #2196F3;"></div>
-            <div class="timeline-text">
-                <strong>Cierre contable mensual</strong><br>
-                <span style="color: #777;">01/05/2025</span>
-            </div>
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
 
-with col2:
+    st.markdown(TIMELINE_HTML, unsafe_allow_html=True)
+
+def _render_transacciones(df_filtrado):
     # Tabla de transacciones recientes
     st.markdown("### Transacciones recientes")
-    
-    # Formatear datos para la tabla
-    tabla_df = df_filtrado.tail(10).copy()
-    tabla_df["Tipo"] = np.where(tabla_df["Flujo Neto"] >= 0, "Ingreso", "Egreso")
-    tabla_df["Estado"] = np.random.choice(["Completado", "Pendiente", "En proceso"], size=len(tabla_df))
-    
-    # Crear columnas con íconos para mejor visualización
-    def formato_tabla(df):
-        # Formatear montos
-        formato = {
-            "Ingresos": "${:,.2f}", 
-            "Egresos": "${:,.2f}", 
-            "Flujo Neto": "${:,.2f}"
-        }
-        
-        # Aplicar formato solo a las columnas que existen
-        formato_existente = {k: v for k, v in formato.items() if k in df.columns}
-        df = df.style.format(formato_existente)
-        
-        # Aplicar colores según valores solo para la columna Flujo Neto si existe
-        if "Flujo Neto" in df.columns:
-            df = df.map(lambda x: 'color: #4CAF50' if isinstance(x, (int, float)) and x > 0 else 
-                       ('color: #F44336' if isinstance(x, (int, float)) and x < 0 else ''), 
-                       subset=['Flujo Neto'])
-        
-        return df
-    
+
+    # Formatear datos para la tabla (cacheado: solo se recalcula si cambian las filas)
+    # Solo las columnas que usa la tabla: el hash de la caché no recorre descripciones ni saldos
+    tabla_slim = df_filtrado.tail(10)[["Fecha", "Ingresos", "Egresos", "Flujo Neto"]]
+    tabla_df = construir_tabla(tabla_slim)
+
     # Mostrar solo las columnas que queremos en la tabla
     columnas_mostrar = ["Fecha", "Ingresos", "Egresos", "Flujo Neto", "Tipo", "Estado"]
     columnas_existentes = [col for col in columnas_mostrar if col in tabla_df.columns]
-    st.dataframe(formato_tabla(tabla_df[columnas_existentes]), height=300)
+    st.dataframe(
+        tabla_df[columnas_existentes],
+        height=300,
+        hide_index=True,
+        column_config={
+            "Fecha": st.column_config.DatetimeColumn("Fecha", format="DD/MM/YYYY"),
+            "Ingresos": st.column_config.NumberColumn("Ingresos", format="$%.2f"),
+            "Egresos": st.column_config.NumberColumn("Egresos", format="$%.2f"),
+            "Flujo Neto": st.column_config.NumberColumn("Flujo Neto", format="$%.2f"),
+        }
+    )
 
-# Sección final - Estadísticas comparativas
-st.markdown("## Comparativa de Períodos")
+def _render_comparativa(stats, total_ingresos, saldo_actual):
+    st.markdown("## Comparativa de Períodos")
 
-try:
     # Datos comparativos entre periodos
-    periodo_actual = df_filtrado["Flujo Neto"].sum()
-    periodo_anterior = df_filtrado["Flujo Neto"].mean() * 0.8  # Simular datos del periodo anterior
+    periodo_actual = stats["Flujo Neto"]["sum"]
+    periodo_anterior = stats["Flujo Neto"]["mean"] * 0.8  # Simular datos del periodo anterior
 
     # Calcular variaciones
     variacion = ((periodo_actual - periodo_anterior) / abs(periodo_anterior)) * 100 if periodo_anterior != 0 else 0
     variacion_color = "#4CAF50" if variacion >= 0 else "#F44336"
     variacion_icono = "↑" if variacion >= 0 else "↓"
-except Exception:
-    periodo_actual = 0
-    periodo_anterior = 0
-    variacion = 0
-    variacion_color = "#4CAF50"
-    variacion_icono = "-"
 
-comp_cols = st.columns(4)
-
-with comp_cols[0]:
-    st.markdown(f"""
-    <div class="metric-card">
-        <div class="metric-title">INGRESOS VS PERIODO ANTERIOR</div>
-        <div class="metric-value" style="color: {variacion_color};">{variacion_icono} {abs(variacion):.1f}%</div>
-    </div>
-    """, unsafe_allow_html=True)
-
-with comp_cols[1]:
     # Simulación de otra métrica comparativa
     var_egresos = -5.2  # Simulación
     var_color = "#4CAF50" if var_egresos <= 0 else "#F44336"
     var_icono = "↓" if var_egresos <= 0 else "↑"
-    
-    st.markdown(f"""
-    <div class="metric-card">
-        <div class="metric-title">EGRESOS VS PERIODO ANTERIOR</div>
-        <div class="metric-value" style="color: {var_color};">{var_icono} {abs(var_egresos):.1f}%</div>
-    </div>
-    """, unsafe_allow_html=True)
 
-with comp_cols[2]:
     # Métrica de eficiencia
-    try:
-        eficiencia = (periodo_actual / total_ingresos) * 100 if total_ingresos > 0 else 0
-    except Exception:
-        eficiencia = 0
-    
-    st.markdown(f"""
-    <div class="metric-card">
-        <div class="metric-title">EFICIENCIA FINANCIERA</div>
-        <div class="metric-value">{eficiencia:.1f}%</div>
-    </div>
-    """, unsafe_allow_html=True)
+    eficiencia = (periodo_actual / total_ingresos) * 100 if total_ingresos > 0 else 0
 
-with comp_cols[3]:
     # Días de liquidez estimados
-    try:
-        gasto_diario = df_filtrado["Egresos"].mean() if len(df_filtrado) > 0 else 0
-        dias_liquidez = int(saldo_actual / gasto_diario) if gasto_diario > 0 else 0
-    except Exception:
-        dias_liquidez = 0
-    
-    st.markdown(f"""
-    <div class="metric-card">
-        <div class="metric-title">DÍAS DE LIQUIDEZ</div>
-        <div class="metric-value">{dias_liquidez}</div>
-    </div>
-    """, unsafe_allow_html=True)
+    gasto_diario = stats["Egresos"]["mean"]
+    dias = np.divide(saldo_actual, gasto_diario, out=np.zeros(()), where=gasto_diario > 0)
+    dias_liquidez = int(dias) if np.isfinite(dias) else 0
+
+    # Las cuatro tarjetas en una sola escritura: un mensaje a la interfaz en lugar de cuatro.
+    # auto-fit apila las tarjetas en pantallas estrechas, como hacía st.columns
+    st.markdown(
+        '<div style="display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 1rem;">'
+        + metric_card("INGRESOS VS PERIODO ANTERIOR", f"{variacion_icono} {PCT(abs(variacion))}", variacion_color)
+        + metric_card("EGRESOS VS PERIODO ANTERIOR", f"{var_icono} {PCT(abs(var_egresos))}", var_color)
+        + metric_card("EFICIENCIA FINANCIERA", PCT(eficiencia))
+        + metric_card("DÍAS DE LIQUIDEZ", f"{dias_liquidez}")
+        + '</div>',
+        unsafe_allow_html=True
+    )
 
-# Pie de página
-st.markdown("""
-<div style="text-align: center; margin-top: 50px; padding: 20px; color: #666;">
-    <p>Desarrollado por Willo con ❤️ usando Streamlit</p>
-    <p style="font-size: 12px;">Actualizado el {}</p>
-</div>
-""".format(datetime.now().strftime("%d/%m/%Y %H:%M")), unsafe_allow_html=True)
\ No newline at end of file
+# --- DASHBOARD: filtros de periodo, KPIs, gráficos y tablas ---
+# Fragmento: cambiar el periodo solo vuelve a ejecutar este bloque, no la carga de datos.
+# Los selectores viven en el área principal porque un fragmento no puede escribir en st.sidebar.
+@st.fragment
+def _render_dashboard(df_dashboard):
+    st.markdown("### Periodo a visualizar")
+    filtro_cols = st.columns(3)
+    with filtro_cols[0]:
+        periodo_opcion = st.selectbox(
+            "Selecciona el periodo",
+            ["Mes", "Trimestre", "Semestre", "Año completo"],
+            index=0
+        )
+    meses = [
+        "Enero", "Febrero", "Marzo", "Abril", "Mayo", "Junio",
+        "Julio", "Agosto", "Septiembre", "Octubre", "Noviembre", "Diciembre"
+    ]
+    trimestres = ["1er Trimestre", "2do Trimestre", "3er Trimestre", "4to Trimestre"]
+    semestres = ["1er Semestre", "2do Semestre"]
+    anio_actual = datetime.now().year
+    mes_seleccionado = None
+    trimestre_seleccionado = None
+    semestre_seleccionado = None
+    with filtro_cols[1]:
+        if periodo_opcion == "Mes":
+            mes_seleccionado = st.selectbox("Mes", meses, index=datetime.now().month-1)
+        elif periodo_opcion == "Trimestre":
+            trimestre_seleccionado = st.selectbox("Trimestre", trimestres)
+        elif periodo_opcion == "Semestre":
+            semestre_seleccionado = st.selectbox("Semestre", semestres)
+    with filtro_cols[2]:
+        anio_seleccionado = st.selectbox("Año", [anio_actual-2, anio_actual-1, anio_actual], index=2)
+
+    # --- FILTRADO DE FECHAS Y USO EN DASHBOARD ---
+    # Filtrado según periodo seleccionado
+    if periodo_opcion == "Mes" and mes_seleccionado:
+        mes_idx = meses.index(mes_seleccionado) + 1
+        df_filtrado = df_dashboard.loc[f"{anio_seleccionado}-{mes_idx:02d}":f"{anio_seleccionado}-{mes_idx:02d}"]
+    elif periodo_opcion == "Trimestre" and trimestre_seleccionado:
+        trimestre_map = {
+            "1er Trimestre": (1, 3),
+            "2do Trimestre": (4, 6),
+            "3er Trimestre": (7, 9),
+            "4to Trimestre": (10, 12)
+        }
+        inicio, fin = trimestre_map[trimestre_seleccionado]
+        df_filtrado = df_dashboard.loc[f"{anio_seleccionado}-{inicio:02d}":f"{anio_seleccionado}-{fin:02d}"]
+    elif periodo_opcion == "Semestre" and semestre_seleccionado:
+        semestre_map = {
+            "1er Semestre": (1, 6),
+            "2do Semestre": (7, 12)
+        }
+        inicio, fin = semestre_map[semestre_seleccionado]
+        df_filtrado = df_dashboard.loc[f"{anio_seleccionado}-{inicio:02d}":f"{anio_seleccionado}-{fin:02d}"]
+    else:  # Año completo
+        df_filtrado = df_dashboard.loc[f"{anio_seleccionado}":f"{anio_seleccionado}"]
+
+    # Periodo sin datos: un único aviso estático en lugar de KPIs, gráficos y tablas en cero
+    if df_filtrado.empty:
+        st.markdown(EMPTY_STATE_HTML, unsafe_allow_html=True)
+        return
+
+    df_diario = agregar_por_dia(df_filtrado)
+    stats = resumir_periodo(df_filtrado)
+
+    # KPIs en tarjetas modernas
+    st.markdown("## Resumen Financiero")
+    kpi_cols = st.columns(4)
+
+    with kpi_cols[0]:
+        total_ingresos = stats["Ingresos"]["sum"]
+        st.markdown(metric_card("Total Ingresos", MONEY(total_ingresos), "var(--success)", "Periodo actual"), unsafe_allow_html=True)
+
+    with kpi_cols[1]:
+        total_egresos = stats["Egresos"]["sum"]
+        st.markdown(metric_card("Total Egresos", MONEY(total_egresos), "var(--error)", "Periodo actual"), unsafe_allow_html=True)
+
+    with kpi_cols[2]:
+        flujo_neto = total_ingresos - total_egresos
+        color = "var(--success)" if flujo_neto >= 0 else "var(--error)"
+        st.markdown(metric_card("Flujo Neto", MONEY(flujo_neto), color, f"{PCT((flujo_neto/total_ingresos)*100)} del ingreso"), unsafe_allow_html=True)
+
+    with kpi_cols[3]:
+        saldo_actual = stats["Saldo Acumulado"]["last"]
+        fecha_max = stats["Fecha"]["max"].strftime("%d/%m/%Y")
+        color = "var(--success)" if saldo_actual >= 0 else "var(--error)"
+        st.markdown(metric_card("Saldo Actual", MONEY(saldo_actual), color, f"al {fecha_max}"), unsafe_allow_html=True)
+
+    # Visualización principal - Sección de gráficos
+    st.markdown("## Análisis de Flujo de Caja")
+
+    # Pestañas para diferentes análisis
+    tab1, tab2, tab3 = st.tabs(["💵 Ingresos vs Egresos", "📊 Saldo Acumulado", "📈 Tendencias"])
+
+    with tab1:
+        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+        fig = crear_grafico_ingresos_egresos(df_diario)
+        render_fig(fig)
+        st.markdown('</div>', unsafe_allow_html=True)
+
+    with tab2:
+        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+        fig2 = crear_grafico_saldo(df_diario)
+        render_fig(fig2)
+        st.markdown('</div>', unsafe_allow_html=True)
+
+    with tab3:
+        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+        # Análisis de tendencias con medias móviles
+        if len(df_diario) >= 7:  # Solo calcular si hay suficientes datos
+            fig3 = crear_grafico_tendencias(df_diario)
+            render_fig(fig3)
+        else:
+            st.warning("Se necesitan al menos 7 días de datos para mostrar tendencias.")
+        st.markdown('</div>', unsafe_allow_html=True)
+
+    # Sección inferior - Tarjetas y tabla
+    col1, col2 = st.columns([1, 2])
+
+    with col1:
+        _render_balance(stats)
+
+    with col2:
+        _render_transacciones(df_filtrado)
+
+    # Sección final - Estadísticas comparativas
+    _render_comparativa(stats, total_ingresos, saldo_actual)
+
+# Página completa. Los procesos de extracción (spawn) vuelven a ejecutar este script como
+# __mp_main__; el guard evita que repitan la carga de datos y el render del dashboard
+def main():
+    # Configuración de la página
+    st.set_page_config(
+        page_title="Dashboard Financiero", 
+        layout="wide", 
+        initial_sidebar_state="expanded",
+        page_icon="💰"
+    )
+
+    # Estilos CSS modernos - Fase 1
+    st.markdown(f"<style>{_load_css()}</style>", unsafe_allow_html=True)
+
+    # --- PROCESAMIENTO SEGÚN LA FUENTE DE DATOS ---
+    if 'uploaded_file' not in st.session_state:
+        st.session_state['uploaded_file'] = None
+    if 'fuente_datos' not in st.session_state:
+        st.session_state['fuente_datos'] = 'Histórico'
+
+    # Procesamiento de la fuente de datos y definición de df_dashboard
+    if st.session_state['fuente_datos'] == "Nuevo extracto PDF" and st.session_state['uploaded_file'] is not None:
+        df_pdf, extracto_mes = load_and_process_bank_statement(st.session_state['uploaded_file'])
+        if not df_pdf.empty:
+            df_dashboard = df_pdf.copy()
+        else:
+            df_dashboard = cargar_datos_historicos()
+    elif st.session_state['fuente_datos'] == "Histórico":
+        df_dashboard = cargar_datos_historicos()
+        if df_dashboard.empty:
+            df_dashboard = generar_datos()
+    elif st.session_state['fuente_datos'] == "Datos de prueba 2024":
+        df_dashboard = generar_datos_2024()
+    else:
+        df_dashboard = generar_datos()
+
+    # --- UNIFICAR COLUMNAS PARA EL DASHBOARD ---
+    columnas_requeridas = ["Fecha", "Ingresos", "Egresos", "Flujo Neto", "Saldo Acumulado"]
+    for col in columnas_requeridas:
+        if col not in df_dashboard.columns:
+            df_dashboard[col] = 0
+    if "Fecha" in df_dashboard.columns:
+        df_dashboard["Fecha"] = pd.to_datetime(df_dashboard["Fecha"], errors='coerce')
+    df_dashboard = df_dashboard.dropna(subset=["Fecha"]).sort_values("Fecha")
+    # Índice temporal ordenado: los filtros por periodo son búsquedas binarias sobre el índice
+    df_dashboard = df_dashboard.set_index(pd.DatetimeIndex(df_dashboard["Fecha"].to_numpy()))
+
+    # --- SIDEBAR: carga de PDF y selección de fuente ---
+    with st.sidebar:
+        st.markdown("""
+        <div style='text-align: center; margin-bottom: 1.5rem;'>
+            <svg width="40" height="32" viewBox="0 0 40 32" fill="none" xmlns="http://www.w3.org/2000/svg">
+                <rect x="4" y="20" width="6" height="8" rx="2" fill="#2563EB"/>
+                <rect x="12" y="12" width="6" height="16" rx="2" fill="#22C55E"/>
+                <rect x="20" y="6" width="6" height="22" rx="2" fill="#60A5FA"/>
+                <rect x="28" y="2" width="6" height="26" rx="2" fill="#A5B4FC"/>
+            </svg>
+            <div style='font-weight: 700; font-size: 1.25rem; margin-top: 0.5rem; font-family: Inter, sans-serif;'>
+                Control de Flujo de Caja
+            </div>
+        </div>
+        """, unsafe_allow_html=True)
+        st.markdown("### 📄 Cargar Extracto Bancario (PDF)")
+        uploaded_file = st.file_uploader("Selecciona un archivo PDF", type=["pdf"])
+        if uploaded_file is not None:
+            st.session_state['uploaded_file'] = uploaded_file
+        fuente_datos = st.radio(
+            "Fuente de datos",
+            ["Histórico", "Simulado", "Nuevo extracto PDF", "Datos de prueba 2024"],
+            index=0
+        )
+        st.session_state['fuente_datos'] = fuente_datos
+        # Pulsarlo basta para volver a ejecutar la página
+        st.button("Actualizar datos", key="refresh_button")
+
+    # --- Resetear fechas al cambiar la fuente de datos ---
+    if 'fuente_datos_anterior' not in st.session_state or st.session_state['fuente_datos_anterior'] != st.session_state['fuente_datos']:
+        st.session_state['fecha_min'] = df_dashboard["Fecha"].iat[0].date() if not df_dashboard.empty else datetime.today() - timedelta(days=30)
+        st.session_state['fecha_max'] = df_dashboard["Fecha"].iat[-1].date() if not df_dashboard.empty else datetime.today()
+        st.session_state['fuente_datos_anterior'] = st.session_state['fuente_datos']
+
+    # Contenedor principal
+    st.markdown('<div style="padding: 10px">', unsafe_allow_html=True)
+
+    # Encabezado con estadísticas principales
+    st.markdown('<div style="display: flex; justify-content: space-between; align-items: center;">', unsafe_allow_html=True)
+    st.markdown("# 💰 Dashboard Financiero")
+    st.markdown("</div>", unsafe_allow_html=True)
+    st.markdown('<p style="color: #666; margin-bottom: 30px;">Actualizado: ' + datetime.now().strftime("%d/%m/%Y %H:%M") + '</p>', unsafe_allow_html=True)
+
+    _render_dashboard(df_dashboard)
+
+    # Pie de página
+    st.markdown(footer_html(), unsafe_allow_html=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+import pandas as pd
+
+# Módulo sin Streamlit: los procesos de extracción lo importan sin ejecutar el dashboard
+
+TABLE_SETTINGS = {
+    "flavor": "lattice",
+    "strip_text": "\n"
+}
+
+# Por debajo de este número de páginas, arrancar procesos e importar Camelot en cada uno
+# cuesta más de lo que ahorra el paralelismo
+MIN_PAGINAS_PARALELO = 4
+
+def extract_range_pdfplumber(pdf_path, pages):
+    # Respaldo para rangos donde Camelot no detecta tablas
+    import pdfplumber
+    inicio, fin = (int(p) for p in pages.split("-"))
+    dfs = []
+    with pdfplumber.open(pdf_path) as pdf:
+        for page in pdf.pages[inicio - 1:fin]:
+            for table in page.extract_tables():
+                dfs.append(pd.DataFrame([[(c or "").replace("\n", "") for c in row] for row in table]))
+    return dfs
+
+def extract_range(args):
+    import camelot
+    pdf_path, pages = args
+    tables = camelot.read_pdf(pdf_path, pages=pages, **TABLE_SETTINGS)
+    if len(tables) > 0:
+        return [table.df for table in tables]
+    return extract_range_pdfplumber(pdf_path, pages)
+
+def page_ranges(n_pages, n_chunks):
+    if n_pages == 0:
+        return []
+    size = -(-n_pages // max(n_chunks, 1))
+    return [f"{i}-{min(i + size - 1, n_pages)}" for i in range(1, n_pages + 1, size)]